@@ -0,0 +1,671 @@
+"""Generate Voltade blog posts from scraped PepperCloud articles using OpenAI.
+
+Reads ./scraped_posts_manifest.json (written by pepper-cloud-scrapping.py),
+sends every not-yet-generated post to the chat completions API concurrently,
+and writes the results to ./generated_blogs/<category>/<filename>.md.
+"""
+
+import argparse
+import asyncio
+import atexit
+import hashlib
+import json
+import os
+import random
+import zlib
+from datetime import date
+
+from openai import APIStatusError, AsyncOpenAI, OpenAI
+
+MANIFEST_PATH = './scraped_posts_manifest.json'
+OUTPUT_DIR = './generated_blogs'
+
+MODEL = 'gpt-4o-mini'
+TEMPERATURE = 0.7
+MAX_TOKENS = 4000
+MAX_OUTPUT_TOKENS = 16384  # gpt-4o-mini's output ceiling
+
+NUM_CONCURRENT = 10  # max in-flight chat completion requests
+MAX_ATTEMPTS = 5  # attempts per request before giving up on 429/5xx
+GROUP_SIZE = 4  # posts per completion in --group mode: 4 x MAX_TOKENS fits the output ceiling
+MIN_BATCH_SIZE = 10  # below this the Batch API overhead isn't worth the 24h wait
+BATCH_INPUT_PATH = './batch_input.jsonl'
+CACHE_DIR = './.llm_cache'
+
+CATEGORIES = ['Product Updates', 'Grants', 'CRM', 'Sales & Marketing', 'Product Support']
+CATEGORY_MAP = {
+    'Product Updates': 'product-update',
+    'Grants': 'grant',
+    'CRM': 'crm',
+    'Sales & Marketing': 'sales-and-marketing',
+    'Product Support': 'product-support',
+}
+
+client = AsyncOpenAI()
+
+
+def load_manifest(path=MANIFEST_PATH):
+    if not os.path.exists(path):
+        return {'posts': {}}
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_manifest(manifest, path=MANIFEST_PATH):
+    # Underscore keys are the scraper's in-memory lookup indexes; keep them
+    # out of the file when the pipeline shares one manifest dict.
+    serializable = {key: value for key, value in manifest.items() if not key.startswith('_')}
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(serializable, f, indent=2, ensure_ascii=False)
+
+
+CHECKPOINT_EVERY = 20  # manifest updates between on-disk checkpoints
+_updates_since_checkpoint = 0
+
+
+def checkpoint_manifest(manifest):
+    """Count an in-memory manifest update, flushing to disk every CHECKPOINT_EVERY.
+
+    Rewriting and fsyncing the whole manifest once per post is O(N²) JSON work
+    over a run; updates stay in memory and the atexit hook writes the final state.
+    """
+    global _updates_since_checkpoint
+    _updates_since_checkpoint += 1
+    if _updates_since_checkpoint >= CHECKPOINT_EVERY:
+        save_manifest(manifest)
+        _updates_since_checkpoint = 0
+
+
+# Static instruction block sent as the system message. OpenAI automatically
+# caches shared prompt prefixes of 1024+ tokens, so keep this byte-for-byte
+# stable — anything per-post (title, date, content) belongs in the user message.
+SYSTEM_PROMPT = f"""You regenerate scraped blog posts as Voltade blog posts.
+
+IMPORTANT: Return ONLY the blog content. Do NOT wrap your response in markdown code blocks. Start directly with the frontmatter (---).
+
+Use this EXACT format structure:
+
+---
+title: "Rewrite a new title similar to the post's original title"
+description: "Rewrite a new description similar to the post's original description."
+date: "The date given for the post"
+category: "The category given for the post"
+readTime: "Generate based on the content length"
+author: "Voltade Team"
+image: "/images/blog/<the category slug from {json.dumps(CATEGORY_MAP)}>/<the image name given for the post>.jpg"
+tags: "Choose relevant tags from {json.dumps(CATEGORIES)} and make them into an array" (e.g. ["Product Updates", "CRM"])
+showSidebar: false
+showOutline: true
+content: {{ width: "100%" }}
+---
+
+import {{ BlogLayout }} from "../../layouts/BlogpageLayout.tsx";
+
+export const fm = {{
+    title: "Same as the title you assigned to the post",
+    description: "Same as the description you assigned to the post",
+    date: "Same as the date you assigned to the post",
+    category: "Same as the category you assigned to the post",
+    readTime: "Same as the read time you assigned to the post",
+    author: "Voltade Team",
+    image: "Same as the image you assigned to the post",
+    tags: "Same as the tags you assigned to the post",
+}};
+
+<BlogLayout frontmatter={{fm}}>
+
+[The blog content goes here ...]
+
+</BlogLayout>
+
+REQUIREMENTS:
+1. Rewrite the blog post based on the provided content comprehensively
+2. Include success optimization tips
+3. Make it actionable and strategic
+4. DO NOT wrap in markdown code blocks
+5. Wrap the content with the frontmatter and layout"""
+
+
+def build_messages(content, post_data):
+    """Stable system prompt first (prompt-cache friendly), per-post details after."""
+    today = date.today()
+    current_date = f'{today:%B} {today.day}, {today.year}'
+    clean_title = '-'.join(
+        ''.join(c for c in post_data['title'].lower() if c.isalnum() or c in ' -').split()
+    )
+    user_prompt = f"""Regenerate a blog post based on the following content:
+
+Original title: {post_data['title']}
+Original description: {post_data['description']}
+Category: {post_data.get('category', 'Product Updates')}
+Date: {current_date}
+Image name: {clean_title}
+
+{content}"""
+    return [
+        {'role': 'system', 'content': SYSTEM_PROMPT},
+        {'role': 'user', 'content': user_prompt},
+    ]
+
+
+def cache_key(messages):
+    """Key a completion by everything that determines it: model, messages, temperature."""
+    payload = json.dumps(
+        {'model': MODEL, 'messages': messages, 'temperature': TEMPERATURE},
+        sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def cache_get(key):
+    cache_path = os.path.join(CACHE_DIR, f'{key}.json')
+    if not os.path.exists(cache_path):
+        return None
+    with open(cache_path, 'r', encoding='utf-8') as f:
+        return json.load(f)['content']
+
+
+def cache_put(key, content):
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    cache_path = os.path.join(CACHE_DIR, f'{key}.json')
+    # Write-then-rename so a crash never leaves a truncated cache entry behind.
+    tmp_path = f'{cache_path}.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({'model': MODEL, 'content': content}, f, ensure_ascii=False)
+    os.replace(tmp_path, cache_path)
+
+
+def cache_delete(key):
+    cache_path = os.path.join(CACHE_DIR, f'{key}.json')
+    if os.path.exists(cache_path):
+        os.remove(cache_path)
+
+
+async def chat_completion(messages, label, response_format=None, max_tokens=MAX_TOKENS):
+    """Call the chat completions API, retrying 429/5xx with exponential backoff."""
+    for attempt in range(1, MAX_ATTEMPTS + 1):
+        try:
+            kwargs = {
+                'model': MODEL,
+                'messages': messages,
+                'max_tokens': max_tokens,
+                'temperature': TEMPERATURE,
+            }
+            if response_format is not None:
+                kwargs['response_format'] = response_format
+            response = await client.chat.completions.create(**kwargs)
+            return response.choices[0].message.content
+        except APIStatusError as error:
+            retryable = error.status_code == 429 or error.status_code >= 500
+            if not retryable or attempt == MAX_ATTEMPTS:
+                raise
+            delay = 2 ** attempt + random.random()
+            print(
+                f"⏳ OpenAI returned {error.status_code} for '{label}', "
+                f'retrying in {delay:.1f}s (attempt {attempt}/{MAX_ATTEMPTS})'
+            )
+            await asyncio.sleep(delay)
+
+
+async def chat_completion_stream(messages, label):
+    """Stream a chat completion, yielding content deltas as they arrive.
+
+    Retries with backoff around the initial request only; once tokens are
+    flowing a failure surfaces to the caller.
+    """
+    stream = None
+    for attempt in range(1, MAX_ATTEMPTS + 1):
+        try:
+            stream = await client.chat.completions.create(
+                model=MODEL,
+                messages=messages,
+                max_tokens=MAX_TOKENS,
+                temperature=TEMPERATURE,
+                stream=True,
+            )
+            break
+        except APIStatusError as error:
+            retryable = error.status_code == 429 or error.status_code >= 500
+            if not retryable or attempt == MAX_ATTEMPTS:
+                raise
+            delay = 2 ** attempt + random.random()
+            print(
+                f"⏳ OpenAI returned {error.status_code} for '{label}', "
+                f'retrying in {delay:.1f}s (attempt {attempt}/{MAX_ATTEMPTS})'
+            )
+            await asyncio.sleep(delay)
+
+    async for chunk in stream:
+        if chunk.choices and chunk.choices[0].delta.content:
+            yield chunk.choices[0].delta.content
+
+
+async def generate_blog_stream(content, post_data):
+    """Yield one post's generated blog incrementally, via the disk cache.
+
+    Responses are cached on disk under .llm_cache/ so a re-run over the same
+    inputs (e.g. after a crash mid-way) never pays for the same prompt twice.
+    """
+    messages = build_messages(content, post_data)
+
+    key = cache_key(messages)
+    cached = cache_get(key)
+    if cached is not None:
+        print(f"💾 Cache hit: {post_data['title']}")
+        yield cached
+        return
+
+    pieces = []
+    async for piece in chat_completion_stream(messages, post_data['title']):
+        pieces.append(piece)
+        yield piece
+    cache_put(key, ''.join(pieces))
+
+
+def generated_target(post_data):
+    """Return the output path for a post, creating its category directory."""
+    category_path = CATEGORY_MAP.get(post_data.get('category'), 'product-update')
+    output_dir = os.path.join(OUTPUT_DIR, category_path)
+    os.makedirs(output_dir, exist_ok=True)
+    return os.path.join(output_dir, post_data['filename'])
+
+
+def write_generated(post_data, generated_content):
+    """Write a generated blog under ./generated_blogs/<category>/ and return its path."""
+    generated_path = generated_target(post_data)
+    with open(generated_path, 'w', encoding='utf-8') as f:
+        f.write(generated_content)
+    return generated_path
+
+
+def read_text(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+def mark_generated(post_data, generated_path):
+    post_data['generated'] = True
+    post_data['generated_at'] = date.today().isoformat()
+    post_data['generated_path'] = generated_path
+
+
+async def process_post(post_id, post_data, semaphore, manifest, manifest_lock, generated_hashes):
+    """Read one scraped post, generate its blog, write it out and update the manifest."""
+    async with semaphore:
+        # Disk I/O runs in the thread pool so slow reads/writes don't stall
+        # the other in-flight completions.
+        original_content = await asyncio.to_thread(read_text, post_data['content_file'])
+
+        # Skip the API entirely when identical content was already generated.
+        content_hash = hashlib.sha256(original_content.encode('utf-8')).hexdigest()
+        already_generated = generated_hashes.get(content_hash)
+        if already_generated:
+            print(f"⏭️ Unchanged content, reusing {already_generated}: {post_data['title']}")
+            async with manifest_lock:
+                mark_generated(post_data, already_generated)
+                checkpoint_manifest(manifest)
+            return post_id
+
+        print(f"🤖 Generating: {post_data['title']}")
+        # Stream straight to disk so received tokens aren't held in memory
+        # waiting for the completion to finish.
+        generated_path = generated_target(post_data)
+        with open(generated_path, 'w', encoding='utf-8') as f:
+            async for piece in generate_blog_stream(original_content, post_data):
+                f.write(piece)
+
+    async with manifest_lock:
+        mark_generated(post_data, generated_path)
+        checkpoint_manifest(manifest)
+
+    print(f'✅ Wrote {generated_path}')
+    return post_id
+
+
+# ~1 block boundary per 8 lines on average: small enough that a shared CTA or
+# author blurb lands in its own block, large enough that references stay rare.
+CHUNK_BOUNDARY_MOD = 8
+
+
+def split_content_blocks(text):
+    """Split text into blocks at content-defined boundaries.
+
+    A line closes a block when its checksum hits the boundary condition, so an
+    identical run of lines always splits into identical blocks no matter where
+    it sits in a post — which is what lets shared boilerplate (intros, CTAs,
+    author blurbs) align across different posts.
+    """
+    blocks, current = [], []
+    for line in text.splitlines():
+        current.append(line)
+        if zlib.crc32(line.encode('utf-8')) % CHUNK_BOUNDARY_MOD == 0:
+            blocks.append('\n'.join(current))
+            current = []
+    if current:
+        blocks.append('\n'.join(current))
+    return blocks
+
+
+def dedupe_group_content(posts):
+    """Emit text blocks shared between a group's posts once, with references after.
+
+    Returns the (post_id, post_data, content) tuples with duplicated blocks
+    replaced by short references, shrinking the group prompt by the size of
+    whatever boilerplate the scraped posts share.
+    """
+    block_counts = {}
+    split_posts = []
+    for post_id, post_data, content in posts:
+        blocks = split_content_blocks(content)
+        split_posts.append((post_id, post_data, blocks))
+        for block in blocks:
+            digest = hashlib.sha256(block.encode('utf-8')).hexdigest()[:12]
+            block_counts[digest] = block_counts.get(digest, 0) + 1
+
+    emitted = set()
+    deduped = []
+    for post_id, post_data, blocks in split_posts:
+        out = []
+        for block in blocks:
+            digest = hashlib.sha256(block.encode('utf-8')).hexdigest()[:12]
+            if block_counts[digest] == 1 or not block.strip():
+                out.append(block)
+            elif digest in emitted:
+                out.append(f'[See shared block {digest}]')
+            else:
+                emitted.add(digest)
+                out.append(f'[Shared block {digest}]\n{block}')
+        deduped.append((post_id, post_data, '\n'.join(out)))
+    return deduped
+
+
+def build_group_prompt(posts):
+    """Build one prompt that regenerates several posts, sharing the format spec once."""
+    today = date.today()
+    current_date = f'{today:%B} {today.day}, {today.year}'
+    payload = [
+        {
+            'post_id': post_id,
+            'title': post_data['title'],
+            'description': post_data['description'],
+            'category': post_data.get('category', 'Product Updates'),
+            'original': content,
+        }
+        for post_id, post_data, content in posts
+    ]
+
+    return f"""Regenerate the following {len(posts)} blog posts.
+
+Return ONLY a JSON object of the form {{"posts": [{{"post_id": "...", "content": "..."}}]}} with exactly one element per input post, keyed by the given post_id.
+
+Some posts share identical text. A passage marked [Shared block <id>] appears in several posts, and [See shared block <id>] means the passage with that id appears there too — treat it as if that text were written out in full.
+
+Each "content" value must be a complete blog post in this EXACT format structure:
+
+---
+title: "Rewrite a new title similar to the post's original title"
+description: "Rewrite a new description similar to the post's original description."
+date: "{current_date}"
+category: "The post's category"
+readTime: "Generate based on the content length"
+author: "Voltade Team"
+image: "/images/blog/<category slug from {json.dumps(CATEGORY_MAP)}>/<lowercase-hyphenated-title>.jpg"
+tags: "Choose relevant tags from {json.dumps(CATEGORIES)} and make them into an array" (e.g. ["Product Updates", "CRM"])
+showSidebar: false
+showOutline: true
+content: {{ width: "100%" }}
+---
+
+import {{ BlogLayout }} from "../../layouts/BlogpageLayout.tsx";
+
+export const fm = {{
+    title: "Same as the title you assigned to the post",
+    description: "Same as the description you assigned to the post",
+    date: "{current_date}",
+    category: "Same as the category you assigned to the post",
+    readTime: "Same as the read time you assigned to the post",
+    author: "Voltade Team",
+    image: "Same as the image you assigned to the post",
+    tags: "Same as the tags you assigned to the post",
+}};
+
+<BlogLayout frontmatter={{fm}}>
+
+[The blog content goes here ...]
+
+</BlogLayout>
+
+REQUIREMENTS:
+1. Rewrite each blog post based on its provided content comprehensively
+2. Include success optimization tips
+3. Make it actionable and strategic
+4. Do NOT wrap the content values in markdown code blocks
+5. Wrap each content value with the frontmatter and layout
+
+Posts:
+{json.dumps(payload, ensure_ascii=False)}"""
+
+
+async def generate_blogs_batch(posts):
+    """Generate several posts with one completion; returns {post_id: content}."""
+    messages = [{'role': 'user', 'content': build_group_prompt(dedupe_group_content(posts))}]
+
+    key = cache_key(messages)
+    response_text = cache_get(key)
+    from_cache = response_text is not None
+    if from_cache:
+        print(f'💾 Cache hit: group of {len(posts)} posts')
+    else:
+        response_text = await chat_completion(
+            messages,
+            f'group of {len(posts)} posts',
+            response_format={'type': 'json_object'},
+            max_tokens=min(MAX_TOKENS * len(posts), MAX_OUTPUT_TOKENS),
+        )
+
+    # Validate before touching the cache: persisting a truncated or incomplete
+    # response would make every retry replay the same failure from disk.
+    try:
+        parsed = json.loads(response_text)
+    except json.JSONDecodeError as error:
+        if from_cache:
+            cache_delete(key)
+        raise RuntimeError(f'group response is not valid JSON: {error}')
+
+    generated = {
+        entry['post_id']: entry['content']
+        for entry in parsed.get('posts', [])
+        if isinstance(entry, dict) and entry.get('post_id') and entry.get('content')
+    }
+    complete = all(post_id in generated for post_id, _, _ in posts)
+    if complete and not from_cache:
+        cache_put(key, response_text)
+    elif not complete and from_cache:
+        cache_delete(key)
+    return generated
+
+
+async def process_post_group(group, semaphore, manifest, manifest_lock, generated_hashes):
+    """Generate a group of posts in one completion and write each result out."""
+    async with semaphore:
+        posts = []
+        for post_id, post_data in group:
+            original_content = await asyncio.to_thread(read_text, post_data['content_file'])
+
+            content_hash = hashlib.sha256(original_content.encode('utf-8')).hexdigest()
+            already_generated = generated_hashes.get(content_hash)
+            if already_generated:
+                print(f"⏭️ Unchanged content, reusing {already_generated}: {post_data['title']}")
+                async with manifest_lock:
+                    mark_generated(post_data, already_generated)
+                    checkpoint_manifest(manifest)
+                continue
+            posts.append((post_id, post_data, original_content))
+
+        if not posts:
+            return []
+
+        print(f'🤖 Generating group of {len(posts)} posts')
+        generated = await generate_blogs_batch(posts)
+
+    written = []
+    for post_id, post_data, _ in posts:
+        if post_id not in generated:
+            print(f"❌ Missing from group response: {post_data['title']}")
+            continue
+        generated_path = await asyncio.to_thread(write_generated, post_data, generated[post_id])
+        async with manifest_lock:
+            mark_generated(post_data, generated_path)
+            checkpoint_manifest(manifest)
+        print(f'✅ Wrote {generated_path}')
+        written.append(post_id)
+    return written
+
+
+def submit_batch(manifest, ungenerated_posts):
+    """Submit all ungenerated posts as one OpenAI Batch API job (24h window, ~50% cost)."""
+    sync_client = OpenAI()
+
+    with open(BATCH_INPUT_PATH, 'w', encoding='utf-8') as f:
+        for post_id, post_data in ungenerated_posts:
+            with open(post_data['content_file'], 'r', encoding='utf-8') as content_file:
+                original_content = content_file.read()
+            request = {
+                'custom_id': post_id,
+                'method': 'POST',
+                'url': '/v1/chat/completions',
+                'body': {
+                    'model': MODEL,
+                    'messages': build_messages(original_content, post_data),
+                    'max_tokens': MAX_TOKENS,
+                    'temperature': TEMPERATURE,
+                },
+            }
+            f.write(json.dumps(request, ensure_ascii=False) + '\n')
+
+    with open(BATCH_INPUT_PATH, 'rb') as f:
+        input_file = sync_client.files.create(file=f, purpose='batch')
+    batch = sync_client.batches.create(
+        input_file_id=input_file.id,
+        endpoint='/v1/chat/completions',
+        completion_window='24h',
+    )
+
+    manifest['batch_id'] = batch.id
+    save_manifest(manifest)
+    print(f'📦 Submitted batch {batch.id} with {len(ungenerated_posts)} posts')
+    print('   Run again with --poll once the batch completes (up to 24h)')
+
+
+def poll_batch(manifest):
+    """Check the pending batch and, once completed, write out every generated blog."""
+    batch_id = manifest.get('batch_id')
+    if not batch_id:
+        print('❌ No pending batch in the manifest, submit one with --batch first')
+        return
+
+    sync_client = OpenAI()
+    batch = sync_client.batches.retrieve(batch_id)
+    print(f'📦 Batch {batch_id}: {batch.status}')
+    if batch.status != 'completed':
+        return
+
+    output = sync_client.files.content(batch.output_file_id)
+    generated = 0
+    for line in output.text.splitlines():
+        result = json.loads(line)
+        post_data = manifest['posts'].get(result['custom_id'])
+        if post_data is None:
+            print(f"⚠️ Batch result for unknown post: {result['custom_id']}")
+            continue
+        if result.get('error') or result['response']['status_code'] != 200:
+            print(f"❌ Batch request failed for {result['custom_id']}")
+            continue
+        content = result['response']['body']['choices'][0]['message']['content']
+        generated_path = write_generated(post_data, content)
+        mark_generated(post_data, generated_path)
+        generated += 1
+
+    del manifest['batch_id']
+    save_manifest(manifest)
+    print(f'🎉 Batch done: {generated} blogs written')
+
+
+async def main(args):
+    manifest = load_manifest()
+    # Whatever happens, the final manifest state hits disk exactly once at exit.
+    atexit.register(save_manifest, manifest)
+
+    if args.poll:
+        poll_batch(manifest)
+        return
+
+    ungenerated_posts = [
+        (post_id, post_data)
+        for post_id, post_data in manifest['posts'].items()
+        if not post_data.get('generated')
+    ]
+    if not ungenerated_posts:
+        print('✅ Nothing to generate, all scraped posts already have blogs')
+        return
+
+    if args.batch and len(ungenerated_posts) >= MIN_BATCH_SIZE:
+        submit_batch(manifest, ungenerated_posts)
+        return
+    if args.batch:
+        print(
+            f'ℹ️ Only {len(ungenerated_posts)} posts pending '
+            f'(batch needs {MIN_BATCH_SIZE}+), generating directly instead'
+        )
+
+    print(
+        f'📝 Generating {len(ungenerated_posts)} posts '
+        f'with up to {NUM_CONCURRENT} concurrent requests'
+    )
+    semaphore = asyncio.Semaphore(NUM_CONCURRENT)
+    manifest_lock = asyncio.Lock()
+    generated_hashes = {
+        post_data['content_hash']: post_data['generated_path']
+        for post_data in manifest['posts'].values()
+        if post_data.get('generated') and post_data.get('content_hash')
+    }
+    if args.group:
+        groups = [
+            ungenerated_posts[i:i + GROUP_SIZE]
+            for i in range(0, len(ungenerated_posts), GROUP_SIZE)
+        ]
+        tasks = [
+            process_post_group(group, semaphore, manifest, manifest_lock, generated_hashes)
+            for group in groups
+        ]
+    else:
+        tasks = [
+            process_post(post_id, post_data, semaphore, manifest, manifest_lock, generated_hashes)
+            for post_id, post_data in ungenerated_posts
+        ]
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+
+    failures = [result for result in results if isinstance(result, Exception)]
+    print(f'🎉 Done: {len(results) - len(failures)} generated, {len(failures)} failed')
+    for failure in failures:
+        print(f'❌ {failure}')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Generate Voltade blogs from scraped posts')
+    parser.add_argument(
+        '--batch',
+        action='store_true',
+        help='submit posts through the OpenAI Batch API instead of generating now',
+    )
+    parser.add_argument(
+        '--group',
+        action='store_true',
+        help=f'generate {GROUP_SIZE} posts per completion to amortize the format spec',
+    )
+    parser.add_argument(
+        '--poll',
+        action='store_true',
+        help='check the pending batch and write out results if it completed',
+    )
+    asyncio.run(main(parser.parse_args()))
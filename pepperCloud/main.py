@@ -0,0 +1,129 @@
+"""Run scraping and generation as one producer-consumer pipeline.
+
+Instead of scraping everything and then generating everything (total time
+T_scrape + T_generate), the scraper pushes each newly scraped post onto an
+asyncio.Queue and a pool of consumers sends them to OpenAI while the scraper
+is still fetching, so the run takes max(T_scrape, T_generate).
+"""
+
+import asyncio
+import atexit
+import importlib.util
+import os
+
+import httpx
+
+
+def _load_script(module_name, filename):
+    """Import a sibling script whose hyphenated filename rules out a plain import."""
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), filename)
+    spec = importlib.util.spec_from_file_location(module_name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+scraper = _load_script('pepper_cloud_scrapping', 'pepper-cloud-scrapping.py')
+generator = _load_script('generate_blog', 'generate-blog.py')
+
+NUM_CONSUMERS = 10  # generate_consumer tasks pulling from the queue
+
+
+async def scrape_article_to_queue(client, semaphore, manifest, blog_url, tag, queue):
+    """scraper.scrape_article, but hands every new post straight to the consumers."""
+    async with semaphore:
+        scraped, _ = scraper.is_post_scraped(manifest, blog_url)
+        if scraped:
+            print(f'⏭️ Already scraped: {blog_url}')
+            return
+
+        print(f'🔍 Scraping: {blog_url}')
+        scraped_blog = await scraper.scrape_pepperCloud_blog(client, blog_url)
+        if scraped_blog is None:
+            return
+
+        post_id = scraper.record_scraped_post(manifest, scraped_blog, blog_url, tag)
+
+    if post_id is not None:
+        await queue.put((post_id, manifest['posts'][post_id]))
+
+
+async def scrape_producer(queue, manifest):
+    """Scrape every tag and close the queue with one sentinel per consumer."""
+    semaphore = asyncio.Semaphore(scraper.NUM_CONCURRENT)
+    limits = httpx.Limits(max_connections=scraper.MAX_CONNECTIONS)
+    headers = {'User-Agent': scraper.USER_AGENT}
+
+    async def scrape_tag(client, tag):
+        tag_url = f'{scraper.BASE_URL}/tag/{tag}/'
+        print(f'🏷️ Fetching tag page: {tag_url}')
+        response = await client.get(tag_url)
+        response.raise_for_status()
+        article_links = await asyncio.to_thread(scraper.parse_article_links, response.text)
+        print(f'🏷️ {tag}: {len(article_links)} articles')
+        await asyncio.gather(*[
+            scrape_article_to_queue(client, semaphore, manifest, link, tag, queue)
+            for link in article_links
+        ])
+
+    async with httpx.AsyncClient(
+        http2=True, limits=limits, headers=headers, timeout=30.0,
+    ) as client:
+        await asyncio.gather(*[scrape_tag(client, tag) for tag in scraper.TAGS])
+
+    for _ in range(NUM_CONSUMERS):
+        await queue.put(None)
+
+
+async def generate_consumer(queue, semaphore, manifest, manifest_lock, generated_hashes):
+    """Generate posts from the queue until the producer's sentinel arrives."""
+    while True:
+        item = await queue.get()
+        if item is None:
+            return
+        post_id, post_data = item
+        try:
+            await generator.process_post(
+                post_id, post_data, semaphore, manifest, manifest_lock, generated_hashes,
+            )
+        except Exception as error:
+            print(f'❌ Generation failed for {post_id}: {error}')
+
+
+async def main():
+    manifest = scraper.load_manifest()
+    # Whatever happens, the final manifest state hits disk exactly once at exit.
+    atexit.register(scraper.save_manifest, manifest)
+
+    queue = asyncio.Queue()
+    # Posts scraped on earlier runs but never generated go in ahead of the producer.
+    backlog = 0
+    for post_id, post_data in manifest['posts'].items():
+        if not post_data.get('generated'):
+            queue.put_nowait((post_id, post_data))
+            backlog += 1
+    if backlog:
+        print(f'📝 {backlog} previously scraped posts queued for generation')
+
+    semaphore = asyncio.Semaphore(generator.NUM_CONCURRENT)
+    manifest_lock = asyncio.Lock()
+    generated_hashes = {
+        post_data['content_hash']: post_data['generated_path']
+        for post_data in manifest['posts'].values()
+        if post_data.get('generated') and post_data.get('content_hash')
+    }
+
+    await asyncio.gather(
+        scrape_producer(queue, manifest),
+        *[
+            generate_consumer(queue, semaphore, manifest, manifest_lock, generated_hashes)
+            for _ in range(NUM_CONSUMERS)
+        ],
+    )
+
+    generated = sum(1 for post_data in manifest['posts'].values() if post_data.get('generated'))
+    print(f"🎉 Pipeline done: {len(manifest['posts'])} posts scraped, {generated} generated")
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,338 @@
+"""Scrape PepperCloud blog articles per tag and save them for blog generation.
+
+Fetches the listing page for each tag concurrently with httpx, scrapes every
+article that is not yet in ./scraped_posts_manifest.json, and writes the
+OpenAI-ready text to ./scraped_posts/<post_id>.txt.
+"""
+
+import asyncio
+import atexit
+import hashlib
+import json
+import os
+import re
+from datetime import date
+
+import requests
+from selectolax.lexbor import LexborHTMLParser
+
+try:
+    import httpx
+except ImportError:  # fall back to the serial requests path below
+    httpx = None
+
+BASE_URL = 'https://blog.peppercloud.com'
+USER_AGENT = 'voltade-blog-crawler/1.0'
+MANIFEST_PATH = './scraped_posts_manifest.json'
+SCRAPED_DIR = './scraped_posts'
+
+MAX_CONNECTIONS = 20  # connection pool size for the shared client
+NUM_CONCURRENT = 10  # max articles fetched at the same time
+
+# One combined selector returns every content node in document order in a
+# single engine-level traversal, instead of one query per element type.
+CONTENT_SELECTOR = 'p, h1, h2, h3, h4, h5, h6, ul, ol'
+
+# Tag slug on blog.peppercloud.com -> category used by generate-blog.py
+TAGS = {
+    'product-updates': 'Product Updates',
+    'grants': 'Grants',
+    'crm': 'CRM',
+    'sales-marketing': 'Sales & Marketing',
+    'product-support': 'Product Support',
+}
+
+
+def load_manifest(path=MANIFEST_PATH):
+    if os.path.exists(path):
+        with open(path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    else:
+        manifest = {'posts': {}}
+    # In-memory lookup indexes (underscore keys are stripped before saving):
+    # without them every is_post_scraped call scans the whole posts dict.
+    manifest['_url_index'] = {
+        post_data['source_url']: post_id
+        for post_id, post_data in manifest['posts'].items()
+        if post_data.get('source_url')
+    }
+    manifest['_hash_index'] = {
+        post_data['content_hash']: post_id
+        for post_id, post_data in manifest['posts'].items()
+        if post_data.get('content_hash')
+    }
+    return manifest
+
+
+def save_manifest(manifest, path=MANIFEST_PATH):
+    serializable = {key: value for key, value in manifest.items() if not key.startswith('_')}
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(serializable, f, indent=2, ensure_ascii=False)
+
+
+CHECKPOINT_EVERY = 20  # manifest updates between on-disk checkpoints
+_updates_since_checkpoint = 0
+
+
+def checkpoint_manifest(manifest):
+    """Count an in-memory manifest update, flushing to disk every CHECKPOINT_EVERY.
+
+    Rewriting the whole manifest once per article is O(N²) JSON work over a
+    run; updates stay in memory and the atexit hook writes the final state.
+    """
+    global _updates_since_checkpoint
+    _updates_since_checkpoint += 1
+    if _updates_since_checkpoint >= CHECKPOINT_EVERY:
+        save_manifest(manifest)
+        _updates_since_checkpoint = 0
+
+
+# Deletes everything that isn't a word character, space or hyphen — compiled
+# once instead of filtering character by character on every call. Unlike a
+# 256-entry translate table this also drops non-ASCII punctuation (curly
+# apostrophes, em-dashes) that blog titles are full of, while keeping
+# alphanumerics in any script, matching the original isalnum() filter.
+_FILENAME_UNSAFE_RE = re.compile(r'[^\w -]')
+
+
+def clean_filename_for_shell(title):
+    """Turn an article title into a filename that is safe to pass through a shell."""
+    return _FILENAME_UNSAFE_RE.sub('', title).strip().replace(' ', '_')
+
+
+def is_post_scraped(manifest, blog_url, content_hash=None):
+    """Return (already_scraped, post_id) for a blog URL or an identical content hash."""
+    post_id = manifest['_url_index'].get(blog_url)
+    if post_id is not None:
+        return True, post_id
+    if content_hash is not None:
+        post_id = manifest['_hash_index'].get(content_hash)
+        if post_id is not None:
+            return True, post_id
+    return False, None
+
+
+def add_to_manifest(manifest, post_id, post_data):
+    manifest['posts'][post_id] = post_data
+    manifest['_url_index'][post_data['source_url']] = post_id
+    manifest['_hash_index'][post_data['content_hash']] = post_id
+    checkpoint_manifest(manifest)
+
+
+def prepare_for_openai(title, description, category, content_sections):
+    """Flatten the scraped sections into the text block sent to OpenAI."""
+    lines = [f'Title: {title}', f'Description: {description}', f'Category: {category}', '']
+    for section in content_sections:
+        if section.get('heading'):
+            lines.append(f"{section['heading']}:")
+        else:
+            lines.append('Introduction:')
+        for item in section['content']:
+            if item['type'] == 'paragraph':
+                lines.append(f"- {item['text']}")
+            elif item['type'] == 'list':
+                for list_item in item['items']:
+                    lines.append(f"  * {list_item}")
+        lines.append('')
+    return '\n'.join(lines)
+
+
+def parse_article(inner_html_text, blog_url):
+    """Parse one article page and return its fields, or None when unusable."""
+    tree = LexborHTMLParser(inner_html_text)
+
+    title_element = tree.css_first('h1.article-title')
+    if title_element is None:
+        print(f'❌ No title found: {blog_url}')
+        return None
+    title = title_element.text(strip=True)
+
+    excerpt_element = tree.css_first('p.article-excerpt')
+    description = excerpt_element.text(strip=True) if excerpt_element else ''
+
+    blog_content = tree.css_first('section.gh-content')
+    if blog_content is None:
+        print(f'❌ No content found: {blog_url}')
+        return None
+
+    content_sections = []
+    current_section = {'type': 'intro', 'content': []}
+    for node in blog_content.css(CONTENT_SELECTOR):
+        node_text = node.text(strip=True)
+        if not node_text:
+            continue
+        if node.tag.startswith('h'):
+            if current_section['content']:
+                content_sections.append(current_section)
+            current_section = {
+                'type': f'section_{node.tag}',
+                'heading': node_text,
+                'content': [],
+            }
+        elif node.tag in ('ul', 'ol'):
+            # Walk direct children rather than running a second css() query per list.
+            items = [child.text(strip=True) for child in node.iter() if child.tag == 'li']
+            current_section['content'].append({'type': 'list', 'items': [i for i in items if i]})
+        else:
+            current_section['content'].append({'type': 'paragraph', 'text': node_text})
+    if current_section['content']:
+        content_sections.append(current_section)
+
+    return {
+        'title': title,
+        'description': description,
+        'sections': content_sections,
+    }
+
+
+def parse_article_links(html_text):
+    """Parse a tag listing page into a list of absolute article URLs."""
+    homepage = LexborHTMLParser(html_text)
+
+    article_links = []
+    for article in homepage.css('article'):
+        link = article.css_first('a[href]')
+        if link is None:
+            continue
+        href = link.attributes['href']
+        if href.startswith('/'):
+            href = BASE_URL + href
+        if href not in article_links:
+            article_links.append(href)
+    return article_links
+
+
+def record_scraped_post(manifest, scraped_blog, blog_url, tag):
+    """Write a scraped post to disk and register it; returns its post_id, or
+    None for duplicates."""
+    category = TAGS[tag]
+    post_id = clean_filename_for_shell(scraped_blog['title'])
+    ai_ready_context = prepare_for_openai(
+        scraped_blog['title'], scraped_blog['description'], category,
+        scraped_blog['sections'],
+    )
+    content_hash = hashlib.sha256(ai_ready_context.encode('utf-8')).hexdigest()
+    duplicate, duplicate_id = is_post_scraped(manifest, blog_url, content_hash)
+    if duplicate:
+        print(f'⏭️ Identical content already scraped as {duplicate_id}: {blog_url}')
+        return None
+
+    os.makedirs(SCRAPED_DIR, exist_ok=True)
+    content_file = os.path.join(SCRAPED_DIR, f'{post_id}.txt')
+    with open(content_file, 'w', encoding='utf-8') as f:
+        f.write(ai_ready_context)
+
+    add_to_manifest(manifest, post_id, {
+        'title': scraped_blog['title'],
+        'description': scraped_blog['description'],
+        'category': category,
+        'tag': tag,
+        'source_url': blog_url,
+        'filename': f'{post_id}.md',
+        'content_file': content_file,
+        'content_hash': content_hash,
+        'scraped_at': date.today().isoformat(),
+        'generated': False,
+    })
+    print(f"✅ Scraped: {scraped_blog['title']}")
+    return post_id
+
+
+async def scrape_pepperCloud_blog(client, blog_url):
+    """Fetch one article and parse it off the event loop."""
+    response = await client.get(blog_url)
+    response.raise_for_status()
+    # Parse in a worker thread so a large page doesn't block other in-flight fetches.
+    return await asyncio.to_thread(parse_article, response.text, blog_url)
+
+
+async def scrape_article(client, semaphore, manifest, blog_url, tag):
+    async with semaphore:
+        scraped, _ = is_post_scraped(manifest, blog_url)
+        if scraped:
+            print(f'⏭️ Already scraped: {blog_url}')
+            return
+
+        print(f'🔍 Scraping: {blog_url}')
+        scraped_blog = await scrape_pepperCloud_blog(client, blog_url)
+        if scraped_blog is None:
+            return
+
+        record_scraped_post(manifest, scraped_blog, blog_url, tag)
+
+
+async def scrape_tag(client, semaphore, manifest, tag):
+    """Fetch one tag listing page and scrape every article it links to."""
+    tag_url = f'{BASE_URL}/tag/{tag}/'
+    print(f'🏷️ Fetching tag page: {tag_url}')
+    response = await client.get(tag_url)
+    response.raise_for_status()
+
+    article_links = await asyncio.to_thread(parse_article_links, response.text)
+
+    print(f'🏷️ {tag}: {len(article_links)} articles')
+    await asyncio.gather(*[
+        scrape_article(client, semaphore, manifest, link, tag)
+        for link in article_links
+    ])
+
+
+async def main():
+    manifest = load_manifest()
+    # Whatever happens, the final manifest state hits disk exactly once at exit.
+    atexit.register(save_manifest, manifest)
+    semaphore = asyncio.Semaphore(NUM_CONCURRENT)
+    limits = httpx.Limits(max_connections=MAX_CONNECTIONS)
+    headers = {'User-Agent': USER_AGENT}
+    async with httpx.AsyncClient(
+        http2=True, limits=limits, headers=headers, timeout=30.0,
+    ) as client:
+        await asyncio.gather(*[
+            scrape_tag(client, semaphore, manifest, tag) for tag in TAGS
+        ])
+    print(f"🎉 Done: {len(manifest['posts'])} posts in manifest")
+
+
+def make_session():
+    """One keep-alive Session for the sync path: TLS handshakes once per pool slot."""
+    session = requests.Session()
+    session.headers.update({'User-Agent': USER_AGENT})
+    adapter = requests.adapters.HTTPAdapter(pool_connections=10, pool_maxsize=MAX_CONNECTIONS)
+    session.mount('https://', adapter)
+    return session
+
+
+def main_sync():
+    """Serial fallback used when httpx is not installed."""
+    manifest = load_manifest()
+    atexit.register(save_manifest, manifest)
+    session = make_session()
+    for tag in TAGS:
+        tag_url = f'{BASE_URL}/tag/{tag}/'
+        print(f'🏷️ Fetching tag page: {tag_url}')
+        response = session.get(tag_url, timeout=30.0)
+        response.raise_for_status()
+        article_links = parse_article_links(response.text)
+        print(f'🏷️ {tag}: {len(article_links)} articles')
+
+        for blog_url in article_links:
+            scraped, _ = is_post_scraped(manifest, blog_url)
+            if scraped:
+                print(f'⏭️ Already scraped: {blog_url}')
+                continue
+            print(f'🔍 Scraping: {blog_url}')
+            response = session.get(blog_url, timeout=30.0)
+            response.raise_for_status()
+            scraped_blog = parse_article(response.text, blog_url)
+            if scraped_blog is None:
+                continue
+            record_scraped_post(manifest, scraped_blog, blog_url, tag)
+    print(f"🎉 Done: {len(manifest['posts'])} posts in manifest")
+
+
+if __name__ == '__main__':
+    if httpx is None:
+        print('⚠️ httpx not installed, scraping serially with requests')
+        main_sync()
+    else:
+        asyncio.run(main())